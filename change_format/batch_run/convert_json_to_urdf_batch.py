@@ -1,47 +1,72 @@
 #!/usr/bin/env python3
+import asyncio
 import os
-import subprocess
 
 # 根目录
 root_dir = "/home/blackbird/GYH/articulated_assets/acd_test/hssd-data"
 
-# 遍历所有子目录
-for category in os.listdir(root_dir):
-    category_path = os.path.join(root_dir, category)
-    
-    # 确保是目录
-    if os.path.isdir(category_path):
-        print(f"Processing category: {category}")
-        
+# 转换脚本及命令前缀（循环中不变）
+convert_script = "/home/blackbird/GYH/articulated_assets/convert_object_json_to_urdf_pm.py"
+cmd_prefix = ["python3", convert_script]
+
+
+async def run_one(object_json_path, output_urdf_path, semaphore):
+    """运行一次转换子进程（semaphore限制同时运行的进程数；stdout用不到直接丢弃，只收集stderr）"""
+    async with semaphore:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd_prefix, object_json_path, output_urdf_path,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await proc.communicate()
+    return object_json_path, output_urdf_path, proc.returncode, stderr.decode(errors="replace")
+
+
+async def run_all(jobs):
+    """并发执行所有转换，同时最多运行 cpu_count 个子进程；每完成一个就打印其结果"""
+    semaphore = asyncio.Semaphore(os.cpu_count())
+    tasks = [run_one(j, u, semaphore) for j, u in jobs]
+    for task in asyncio.as_completed(tasks):
+        object_json_path, output_urdf_path, returncode, stderr = await task
+        print(f"  Converting {object_json_path}...")
+        if returncode == 0:
+            print(f"    Success: {output_urdf_path}")
+        else:
+            print(f"    Error: {stderr}")
+
+
+# 遍历所有子目录，先收集需要转换的模型
+jobs = []
+with os.scandir(root_dir) as categories:
+    for category in categories:
+        # 确保是目录
+        if not category.is_dir():
+            continue
+        print(f"Processing category: {category.name}")
+
         # 遍历类别下的每个模型目录
-        for model in os.listdir(category_path):
-            model_path = os.path.join(category_path, model)
-            
-            # 确保是目录
-            if os.path.isdir(model_path):
-                object_json_path = os.path.join(model_path, "object.json")
-                
+        with os.scandir(category.path) as models:
+            for model in models:
+                # 确保是目录
+                if not model.is_dir():
+                    continue
+                object_json_path = os.path.join(model.path, "object.json")
+
                 # 检查object.json是否存在
                 if os.path.exists(object_json_path):
                     # 生成输出文件路径
-                    output_urdf_path = os.path.join(model_path, "model_pm.urdf")
-                    
-                    # 调用转换脚本
-                    cmd = [
-                        "python3",
-                        "/home/blackbird/GYH/articulated_assets/convert_object_json_to_urdf_pm.py",
-                        object_json_path,
-                        output_urdf_path
-                    ]
-                    
-                    print(f"  Converting {object_json_path}...")
-                    result = subprocess.run(cmd, capture_output=True, text=True)
-                    
-                    if result.returncode == 0:
-                        print(f"    Success: {output_urdf_path}")
-                    else:
-                        print(f"    Error: {result.stderr}")
+                    output_urdf_path = os.path.join(model.path, "model_pm.urdf")
+                    # URDF 已存在且不早于 object.json 时无需重新转换
+                    try:
+                        if os.path.getmtime(output_urdf_path) >= os.path.getmtime(object_json_path):
+                            print(f"  Up to date: {output_urdf_path}")
+                            continue
+                    except OSError:
+                        pass
+                    jobs.append((object_json_path, output_urdf_path))
                 else:
-                    print(f"  No object.json found in {model_path}")
+                    print(f"  No object.json found in {model.path}")
+
+asyncio.run(run_all(jobs))
 
 print("Conversion completed.")
@@ -3,41 +3,73 @@
 将所有处理后的model_fixed.urdf文件转换为XML格式
 """
 
+import asyncio
 import os
-import subprocess
 import sys
 from pathlib import Path
 
 def find_all_model_fixed_urdf(root_dir):
-    """查找所有model_fixed.urdf文件"""
-    urdf_files = []
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        for filename in filenames:
-            if filename == 'model_fixed.urdf':
-                urdf_files.append(os.path.join(dirpath, filename))
-    return urdf_files
+    """查找所有model_fixed.urdf文件（基于os.scandir的生成器，逐个产出路径；与os.walk一致，无法读取的目录直接跳过）"""
+    stack = [root_dir]
+    while stack:
+        current_dir = stack.pop()
+        try:
+            with os.scandir(current_dir) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name == 'model_fixed.urdf':
+                        yield entry.path
+        except OSError:
+            continue
 
-def convert_urdf_to_xml(urdf_file):
-    """将单个URDF文件转换为XML格式"""
-    # 构建输出文件路径
-    xml_file = urdf_file.replace('.urdf', '.xml')
+async def convert_urdf_to_xml(urdf_file, semaphore):
+    """将单个URDF文件转换为XML格式（semaphore限制同时运行的urdf2mjcf进程数）"""
+    # 构建输出文件路径（只替换后缀，避免误改父目录名中的'.urdf'）
+    xml_file = str(Path(urdf_file).with_suffix('.xml'))
     
-    # 构建urdf2mjcf命令
-    cmd = ['urdf2mjcf', urdf_file, xml_file]
+    async with semaphore:
+        try:
+            # 执行转换（stdout不需要，直接丢弃；stderr保留用于失败时输出）
+            proc = await asyncio.create_subprocess_exec(
+                'urdf2mjcf', urdf_file, xml_file,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError:
+            return False, "错误: 找不到urdf2mjcf命令，请确保已安装"
+        except Exception as e:
+            return False, f"转换出错: {urdf_file}, 错误: {e}"
+        
+        try:
+            _, stderr = await asyncio.wait_for(proc.communicate(), timeout=60)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return False, f"转换超时: {urdf_file}"
+    
+    if proc.returncode == 0:
+        return True, f"成功转换: {urdf_file} -> {xml_file}"
+    else:
+        return False, f"转换失败: {urdf_file}\n  stderr: {stderr.decode(errors='replace')}"
+
+async def convert_all(urdf_files):
+    """并发转换所有URDF文件，返回(成功数, 失败数)"""
+    semaphore = asyncio.Semaphore(os.cpu_count())
+    tasks = [convert_urdf_to_xml(f, semaphore) for f in urdf_files]
+    success_count = 0
+    fail_count = 0
     
-    try:
-        # 执行转换
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-        if result.returncode == 0:
-            return True, f"成功转换: {urdf_file} -> {xml_file}"
+    for i, task in enumerate(asyncio.as_completed(tasks), 1):
+        success, message = await task
+        print(f"[{i}/{len(urdf_files)}] {message}")
+        
+        if success:
+            success_count += 1
         else:
-            return False, f"转换失败: {urdf_file}\n  stderr: {result.stderr}"
-    except subprocess.TimeoutExpired:
-        return False, f"转换超时: {urdf_file}"
-    except FileNotFoundError:
-        return False, "错误: 找不到urdf2mjcf命令，请确保已安装"
-    except Exception as e:
-        return False, f"转换出错: {urdf_file}, 错误: {e}"
+            fail_count += 1
+    
+    return success_count, fail_count
 
 def main():
     # 定义路径
@@ -50,23 +82,12 @@ def main():
     
     # 查找所有model_fixed.urdf文件
     print("正在查找所有model_fixed.urdf文件...")
-    urdf_files = find_all_model_fixed_urdf(articulated_assets_dir)
+    urdf_files = list(find_all_model_fixed_urdf(articulated_assets_dir))
     print(f"找到 {len(urdf_files)} 个model_fixed.urdf文件")
     
     # 转换每个URDF文件为XML格式
     print("\n开始转换URDF文件为XML格式...")
-    success_count = 0
-    fail_count = 0
-    
-    for i, urdf_file in enumerate(urdf_files, 1):
-        print(f"[{i}/{len(urdf_files)}] ", end="")
-        success, message = convert_urdf_to_xml(urdf_file)
-        print(message)
-        
-        if success:
-            success_count += 1
-        else:
-            fail_count += 1
+    success_count, fail_count = asyncio.run(convert_all(urdf_files))
     
     print(f"\n========== 转换统计 ==========")
     print(f"总文件数: {len(urdf_files)}")
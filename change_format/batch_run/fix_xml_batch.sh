@@ -5,6 +5,8 @@
 
 INPUT_DIR="/home/blackbird/GYH/out_pm"
 FIX_SCRIPT="/home/blackbird/GYH/urdf_xml_usd_convert/change_format/fix_xml.py"
+# 同时运行的修复进程数（默认等于CPU核数，可通过环境变量JOBS覆盖）
+JOBS="${JOBS:-$(nproc)}"
 
 # 检查修复脚本是否存在
 if [ ! -f "$FIX_SCRIPT" ]; then
@@ -12,39 +14,51 @@ if [ ! -f "$FIX_SCRIPT" ]; then
     exit 1
 fi
 
-# 计数器
-total_files=0
-processed_files=0
-failed_files=0
+# 后台任务无法修改父shell中的计数器，每个任务把结果追加到状态文件，最后统一统计
+status_file=$(mktemp)
+trap 'rm -f "$status_file"' EXIT
 
-echo "开始修复 XML 文件..."
-echo "=========================="
+fix_one() {
+    local xml_file="$1"
 
-# 遍历所有子目录中的 model_fixed.xml 文件
-find "$INPUT_DIR" -name "model_fixed.xml" -type f | while read xml_file; do
-    ((total_files++))
-    
     # 获取文件所在目录
+    local dir_path
     dir_path=$(dirname "$xml_file")
-    
+
     # 定义输出文件路径
-    output_file="$dir_path/model_fixed1.xml"
-    
-    echo "正在处理: $xml_file"
-    
-    # 运行修复脚本
-    if python3 "$FIX_SCRIPT" "$xml_file" "$output_file"; then
-        ((processed_files++))
-        echo "成功修复: $xml_file -> $output_file"
+    local output_file="$dir_path/model_fixed1.xml"
+
+    # 运行修复脚本，输出先收集起来，结束后一次性打印，避免并发时互相穿插
+    local output
+    if output=$(python3 "$FIX_SCRIPT" "$xml_file" "$output_file" 2>&1); then
+        echo "ok" >> "$status_file"
+        printf '正在处理: %s\n%s\n成功修复: %s -> %s\n--------------------------\n' \
+            "$xml_file" "$output" "$xml_file" "$output_file"
     else
-        ((failed_files++))
-        echo "修复失败: $xml_file"
+        echo "fail" >> "$status_file"
+        printf '正在处理: %s\n%s\n修复失败: %s\n--------------------------\n' \
+            "$xml_file" "$output" "$xml_file"
     fi
-    
-    echo "--------------------------"
-done
+}
+
+echo "开始修复 XML 文件..."
+echo "=========================="
+
+# 遍历所有子目录中的 model_fixed.xml 文件，最多同时运行 JOBS 个修复进程
+while IFS= read -r -d '' xml_file; do
+    while (( $(jobs -rp | wc -l) >= JOBS )); do
+        wait -n
+    done
+    fix_one "$xml_file" &
+done < <(find "$INPUT_DIR" -name "model_fixed.xml" -type f -print0)
+wait
+
+# 计数器
+processed_files=$(grep -c '^ok$' "$status_file")
+failed_files=$(grep -c '^fail$' "$status_file")
+total_files=$((processed_files + failed_files))
 
 echo "处理完成!"
 echo "总计文件数: $total_files"
 echo "成功处理: $processed_files"
-echo "处理失败: $failed_files"
\ No newline at end of file
+echo "处理失败: $failed_files"
@@ -1,12 +1,28 @@
+import asyncio
+import functools
+import logging
+import mmap
 import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
-def rename_obj_files(objs_directory):
+logger = logging.getLogger(__name__)
+
+# 同时处理的模型目录数上限
+MAX_CONCURRENT_MODELS = 64
+
+def setup_logging():
+    """配置日志输出到stdout"""
+    logging.basicConfig(format='%(message)s', stream=sys.stdout, level=logging.INFO)
+
+def rename_files(directory, exts):
     """
-    将objs目录中所有包含横线的obj文件名中的横线替换为下划线
+    将目录中所有包含横线且后缀属于exts的文件名中的横线替换为下划线
     
     Args:
-        objs_directory (str): objs目录路径
+        directory (str): 目录路径
+        exts (tuple): 需要处理的文件后缀，例如 ('.obj',)
         
     Returns:
         dict: 旧文件名到新文件名的映射
@@ -15,29 +31,38 @@ def rename_obj_files(objs_directory):
     file_mapping = {}
     
     # 检查目录是否存在
-    if not os.path.exists(objs_directory):
+    if not os.path.isdir(directory):
         return file_mapping
     
-    # 遍历objs目录中的所有文件
-    for filename in os.listdir(objs_directory):
-        # 检查是否是obj或mtl文件且文件名包含横线
-        if (filename.endswith('.obj') ) and '-' in filename:
-            # 生成新文件名，将横线替换为下划线
-            new_filename = filename.replace('-', '_')
-            
-            # 构造完整路径
-            old_filepath = os.path.join(objs_directory, filename)
-            new_filepath = os.path.join(objs_directory, new_filename)
+    # os.scandir直接复用目录项信息，无需额外stat
+    with os.scandir(directory) as it:
+        for entry in it:
+            filename = entry.name
+            # 检查文件名是否包含横线且后缀匹配
+            if '-' not in filename or not filename.endswith(exts) or not entry.is_file():
+                continue
             
-            # 重命名文件
-            os.rename(old_filepath, new_filepath)
-            print(f"重命名文件: {filename} -> {new_filename}")
+            # 生成新文件名，将横线替换为下划线，并重命名文件
+            new_filename = filename.replace('-', '_')
+            os.rename(entry.path, os.path.join(directory, new_filename))
             
             # 记录映射关系
             file_mapping[filename] = new_filename
     
     return file_mapping
 
+def rename_obj_files(objs_directory):
+    """
+    将objs目录中所有包含横线的obj文件名中的横线替换为下划线
+    
+    Args:
+        objs_directory (str): objs目录路径
+        
+    Returns:
+        dict: 旧文件名到新文件名的映射
+    """
+    return rename_files(objs_directory, ('.obj',))
+
 def rename_ply_files(plys_directory):
     """
     将plys目录中所有包含横线的ply文件名中的横线替换为下划线
@@ -48,32 +73,50 @@ def rename_ply_files(plys_directory):
     Returns:
         dict: 旧文件名到新文件名的映射
     """
-    # 存储文件名映射关系
-    file_mapping = {}
+    return rename_files(plys_directory, ('.ply',))
+
+@functools.lru_cache(maxsize=1024)
+def build_reference_pattern(obj_items, ply_items):
+    """
+    根据重命名映射构建引用替换表和合并后的正则
     
-    # 检查目录是否存在
-    if not os.path.exists(plys_directory):
-        return file_mapping
+    结果会被缓存：不同模型目录中同名文件的重命名映射相同，只需编译一次正则
     
-    # 遍历plys目录中的所有文件
-    for filename in os.listdir(plys_directory):
-        # 检查是否是ply文件且文件名包含横线
-        if filename.endswith('.ply') and '-' in filename:
-            # 生成新文件名，将横线替换为下划线
-            new_filename = filename.replace('-', '_')
-            
-            # 构造完整路径
-            old_filepath = os.path.join(plys_directory, filename)
-            new_filepath = os.path.join(plys_directory, new_filename)
-            
-            # 重命名文件
-            os.rename(old_filepath, new_filepath)
-            print(f"重命名文件: {filename} -> {new_filename}")
-            
-            # 记录映射关系
-            file_mapping[filename] = new_filename
+    Args:
+        obj_items (frozenset): obj的(旧文件名, 新文件名)对
+        ply_items (frozenset): ply的(旧文件名, 新文件名)对
+        
+    Returns:
+        tuple: (旧引用到新引用的字节映射, 编译好的正则, 新旧引用是否全部等长)
+    """
+    reference_mapping = {f'filename="objs/{o}"'.encode('utf-8'): f'filename="objs/{n}"'.encode('utf-8') for o, n in obj_items}
+    reference_mapping.update({f'filename="plys/{o}"'.encode('utf-8'): f'filename="plys/{n}"'.encode('utf-8') for o, n in ply_items})
+    pattern = re.compile(b'|'.join(re.escape(k) for k in reference_mapping))
+    same_length = all(len(k) == len(v) for k, v in reference_mapping.items())
+    return reference_mapping, pattern, same_length
+
+def replace_references_inplace(urdf_file_path, reference_mapping, pattern):
+    """
+    通过mmap在文件上原地替换等长的引用，避免整文件读入、解码再写回
     
-    return file_mapping
+    Args:
+        urdf_file_path (str): URDF文件路径
+        reference_mapping (dict): 旧引用到新引用的字节映射（新旧引用长度必须相同）
+        pattern (re.Pattern): 匹配所有旧引用的正则
+        
+    Returns:
+        int: 替换次数
+    """
+    with open(urdf_file_path, 'r+b') as f:
+        # 空文件无法mmap，也不可能有引用
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0) as mm:
+            spans = [(m.start(), m.end()) for m in pattern.finditer(mm)]
+            for start, end in spans:
+                mm[start:end] = reference_mapping[mm[start:end]]
+    
+    return len(spans)
 
 def update_urdf_references(urdf_file_path, obj_file_mapping, ply_file_mapping):
     """
@@ -84,119 +127,159 @@ def update_urdf_references(urdf_file_path, obj_file_mapping, ply_file_mapping):
         obj_file_mapping (dict): obj旧文件名到新文件名的映射
         ply_file_mapping (dict): ply旧文件名到新文件名的映射
     """
-    # 检查文件是否存在
+    # 没有任何重命名或文件不存在时，无需读写URDF
+    if not obj_file_mapping and not ply_file_mapping:
+        return 0
     if not os.path.exists(urdf_file_path):
         return 0
     
-    # 读取URDF文件内容
-    with open(urdf_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    # 构建旧引用到新引用的映射及对应的正则
+    reference_mapping, pattern, same_length = build_reference_pattern(
+        frozenset(obj_file_mapping.items()), frozenset(ply_file_mapping.items())
+    )
     
-    # 统计替换次数
-    replacement_count = 0
+    # 横线换成下划线不改变长度，可以直接在文件上原地替换
+    if same_length:
+        return replace_references_inplace(urdf_file_path, reference_mapping, pattern)
     
-    # 根据映射关系替换obj文件名
-    for old_name, new_name in obj_file_mapping.items():
-        # 创建要查找的旧引用和新引用
-        old_reference = f'filename="objs/{old_name}"'
-        new_reference = f'filename="objs/{new_name}"'
-        
-        # 执行替换并统计次数
-        content, count = re.subn(re.escape(old_reference), new_reference, content)
-        replacement_count += count
-    
-    # 根据映射关系替换ply文件名
-    for old_name, new_name in ply_file_mapping.items():
-        # 创建要查找的旧引用和新引用
-        old_reference = f'filename="plys/{old_name}"'
-        new_reference = f'filename="plys/{new_name}"'
-        
-        # 执行替换并统计次数
-        content, count = re.subn(re.escape(old_reference), new_reference, content)
-        replacement_count += count
+    # 读取URDF文件内容
+    with open(urdf_file_path, 'rb') as f:
+        content = f.read()
     
-    # 将更新后的内容写回文件
-    with open(urdf_file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    # 所有旧引用合并成一个正则，只扫描一遍文件内容
+    content, replacement_count = pattern.subn(lambda m: reference_mapping[m.group(0)], content)
     
+    # 仅在确实发生替换时才写回文件
     if replacement_count > 0:
-        print(f"在 {urdf_file_path} 中完成了 {replacement_count} 处替换")
+        with open(urdf_file_path, 'wb') as f:
+            f.write(content)
     
     return replacement_count
 
-def process_model_directory(model_dir):
+def process_model_directory(model_dir, messages):
     """
     处理单个模型目录中的所有相关文件
     
     Args:
         model_dir (str): 模型目录路径
+        messages (list): 该目录的日志行，处理完后由调用方整块输出
     """
     objs_directory = os.path.join(model_dir, "objs")
     plys_directory = os.path.join(model_dir, "plys")
     urdf_file_path = os.path.join(model_dir, "model_fixed.urdf")
     
-    print(f"\n正在处理目录: {model_dir}")
-    
     # 重命名obj文件
     obj_file_mapping = rename_obj_files(objs_directory)
+    messages.extend(f"重命名文件: {o} -> {n}" for o, n in obj_file_mapping.items())
     
     # 重命名ply文件
     ply_file_mapping = rename_ply_files(plys_directory)
+    messages.extend(f"重命名文件: {o} -> {n}" for o, n in ply_file_mapping.items())
     
     total_renamed = len(obj_file_mapping) + len(ply_file_mapping)
     if total_renamed > 0:
-        print(f"完成重命名 {len(obj_file_mapping)} 个obj文件和 {len(ply_file_mapping)} 个ply文件")
+        messages.append(f"完成重命名 {len(obj_file_mapping)} 个obj文件和 {len(ply_file_mapping)} 个ply文件")
         
         # 更新URDF文件中的引用
         replacement_count = update_urdf_references(urdf_file_path, obj_file_mapping, ply_file_mapping)
         if replacement_count > 0:
-            print(f"总共更新了 {replacement_count} 处引用")
+            messages.append(f"在 {urdf_file_path} 中完成了 {replacement_count} 处替换")
+            messages.append(f"总共更新了 {replacement_count} 处引用")
     else:
-        print("没有找到需要重命名的文件")
+        messages.append("没有找到需要重命名的文件")
 
-def process_all_models(base_directory):
+def process_model_directory_safe(model_dir):
     """
-    递归处理base_directory下所有的模型目录
+    处理单个模型目录，出错时只打印错误而不影响其它目录
+    
+    多个目录在线程中并发处理，每个目录的日志先收集起来，最后作为一整块输出，
+    避免不同目录的日志行互相穿插
+    
+    Args:
+        model_dir (str): 模型目录路径
+    """
+    messages = [f"\n正在处理目录: {model_dir}"]
+    level = logging.INFO
+    try:
+        process_model_directory(model_dir, messages)
+    except Exception as e:
+        level = logging.ERROR
+        messages.append(f"处理目录 {model_dir} 时出错: {e}")
+    logger.log(level, "\n".join(messages))
+
+def find_model_directories(base_directory):
+    """
+    收集base_directory下所有需要处理的模型目录
     
     Args:
         base_directory (str): 基础目录路径
+        
+    Returns:
+        list: 模型目录路径列表
     """
+    model_paths = []
+    
     # 遍历所有模型类别目录
-    for category in os.listdir(base_directory):
-        category_path = os.path.join(base_directory, category)
-        
-        # 确保是一个目录
-        if os.path.isdir(category_path):
-            print(f"\n处理模型类别: {category}")
+    with os.scandir(base_directory) as categories:
+        for category in categories:
+            # 确保是一个目录
+            if not category.is_dir():
+                continue
+            logger.info("\n处理模型类别: %s", category.name)
             
             # 遍历该类别下的所有模型目录
-            for model in os.listdir(category_path):
-                model_path = os.path.join(category_path, model)
-                
-                # 确保是一个模型目录（包含objs或plys子目录）
-                if os.path.isdir(model_path):
-                    objs_dir = os.path.join(model_path, "objs")
-                    plys_dir = os.path.join(model_path, "plys")
-                    
-                    # 如果该目录包含objs或plys子目录，则处理它
+            with os.scandir(category.path) as models:
+                for model in models:
+                    # 确保是一个模型目录（包含objs或plys子目录）
+                    if not model.is_dir():
+                        continue
+                    objs_dir = os.path.join(model.path, "objs")
+                    plys_dir = os.path.join(model.path, "plys")
                     if os.path.exists(objs_dir) or os.path.exists(plys_dir):
-                        try:
-                            process_model_directory(model_path)
-                        except Exception as e:
-                            print(f"处理目录 {model_path} 时出错: {e}")
+                        model_paths.append(model.path)
+    
+    return model_paths
+
+async def process_model_directories(model_paths):
+    """
+    并发处理所有模型目录
+    
+    重命名等文件系统调用在NFS等网络文件系统上延迟较高，放到线程中并发执行，
+    线程池大小即同时进行的目录数上限
+    
+    Args:
+        model_paths (list): 模型目录路径列表
+    """
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_MODELS) as executor:
+        await asyncio.gather(
+            *(loop.run_in_executor(executor, process_model_directory_safe, p) for p in model_paths)
+        )
+
+def process_all_models(base_directory):
+    """
+    递归处理base_directory下所有的模型目录
+    
+    Args:
+        base_directory (str): 基础目录路径
+    """
+    model_paths = find_model_directories(base_directory)
+    asyncio.run(process_model_directories(model_paths))
 
 def main():
+    setup_logging()
+    
     # 设置路径
     base_directory = "/home/blackbird/GYH/back_pm"
     
     # 检查基础目录是否存在
     if not os.path.exists(base_directory):
-        print(f"错误: 目录 {base_directory} 不存在")
+        logger.error("错误: 目录 %s 不存在", base_directory)
         return
     
-    print("开始递归处理所有模型目录...")
+    logger.info("开始递归处理所有模型目录...")
     process_all_models(base_directory)
-    print("\n所有操作已完成!")
+    logger.info("\n所有操作已完成!")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -20,99 +20,245 @@ Object.json to URDF Converter
 日期: 2025-11-26
 """
 
+import contextlib
+import functools
+import io
 import json
+import math
 import numpy as np
-from xml.etree.ElementTree import Element, SubElement, tostring, Comment
-from xml.dom import minidom
+from xml.sax.saxutils import quoteattr
 import os
 import sys
 import argparse
-import glob
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
+# 批量转换时object.json解析次数很多，有orjson就用更快的orjson（可选依赖）
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def get_mesh_origin(part, diffuse_tree):
+
+def _loads(data):
+    """解析JSON：优先orjson；orjson不接受NaN/Infinity等json模块允许的写法，失败时回退到json.loads"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def analyze_diffuse_tree(diffuse_tree):
     """
-    计算mesh origin - 核心函数
+    遍历一次diffuse_tree，找到base_link并计算所有部件的mesh origin - 核心函数
     
     统一规则：
-    - 主部件（revolute/prismatic）: mesh_origin = -joint_origin
+    - 主部件（revolute/prismatic/continuous）: mesh_origin = -joint_origin
     - Fixed子部件: mesh_origin = -parent_joint_origin
     - Base: mesh_origin = [0, 0, 0]
+    - 缺少axis.origin或joint类型未知时打印警告，使用[0, 0, 0]
+    
+    用一遍循环把每个部件的joint origin收集到(N, 3)数组中（同时记录base_link），
+    再按joint类型整体取负/按parent索引取值，避免每个部件单独分配数组。
+    
+    base_link通常是最后一个fixed类型且没有parent的部件，找不到时默认最后一个。
     
     Args:
-        part (dict): 当前部件的数据（来自diffuse_tree）
         diffuse_tree (list): 完整的diffuse_tree列表
     
     Returns:
-        numpy.ndarray: mesh origin的[x, y, z]坐标
-    
-    Examples:
-        >>> part = {"joint": {"type": "revolute", "axis": {"origin": [-0.45, -0.08, 0.31]}}}
-        >>> get_mesh_origin(part, [])
-        array([ 0.45,  0.08, -0.31])
+        tuple: (base link的索引, 形状为(N, 3)的mesh origin数组，第i行对应diffuse_tree[i])
     """
-    joint_type = part['joint']['type']
+    n = len(diffuse_tree)
+    joint_origins = np.zeros((n, 3))
+    has_origin = np.zeros(n, dtype=bool)
+    parent_idx = np.zeros(n, dtype=int)
+    has_parent = np.zeros(n, dtype=bool)
+    jtypes = []
+    base_id = n - 1  # 默认最后一个
     
-    if joint_type in ['revolute', 'prismatic', 'continuous']:
-        # 主部件：使用自己的joint origin
-        if 'axis' in part['joint'] and 'origin' in part['joint']['axis']:
-            joint_origin = np.array(part['joint']['axis']['origin'])
-            return -joint_origin
-        else:
-            print(f"⚠️  警告: part缺少axis.origin字段，使用默认值[0,0,0]")
-            return np.array([0.0, 0.0, 0.0])
-    
-    elif joint_type == 'fixed':
-        # Fixed子部件：使用parent的joint origin
+    for i, part in enumerate(diffuse_tree):
+        joint = part['joint']
+        jtypes.append(joint['type'])
+        if 'axis' in joint and 'origin' in joint['axis']:
+            joint_origins[i] = joint['axis']['origin']
+            has_origin[i] = True
         if 'parent' in part and part['parent'] is not None:
-            parent_id = part['parent']
-            parent_part = diffuse_tree[parent_id]
-            # 检查parent是否有axis和origin字段
-            if 'axis' in parent_part['joint'] and 'origin' in parent_part['joint']['axis']:
-                parent_joint_origin = np.array(parent_part['joint']['axis']['origin'])
-                return -parent_joint_origin
-            else:
-                print(f"⚠️  警告: parent part {parent_id} 缺少axis.origin字段，使用默认值[0,0,0]")
-                return np.array([0.0, 0.0, 0.0])
+            parent_idx[i] = part['parent']
+            has_parent[i] = True
+        elif joint['type'] == 'fixed':
+            base_id = i
+    
+    jtypes = np.array(jtypes)
+    main_mask = np.isin(jtypes, ['revolute', 'prismatic', 'continuous'])
+    fixed_mask = (jtypes == 'fixed') & has_parent
+    # 只对fixed子部件取parent：主部件的parent可能越界（建joint时会警告并跳过），不能拿来索引；
+    # parent索引为负数时按Python规则从末尾取
+    parent_has_origin = np.zeros(n, dtype=bool)
+    parent_has_origin[fixed_mask] = has_origin[parent_idx[fixed_mask]]
+    
+    # 缺少origin的部件保持[0,0,0]（不取负，避免得到-0.0）
+    mesh_origins = np.zeros((n, 3))
+    main_ok = main_mask & has_origin
+    fixed_ok = fixed_mask & parent_has_origin
+    mesh_origins[main_ok] = -joint_origins[main_ok]
+    mesh_origins[fixed_ok] = -joint_origins[parent_idx[fixed_ok]]
+    
+    # 按部件顺序输出警告
+    unknown_mask = ~main_mask & (jtypes != 'fixed')
+    for i in np.flatnonzero((main_mask & ~has_origin) | (fixed_mask & ~parent_has_origin) | unknown_mask):
+        if main_mask[i]:
+            print(f"⚠️  警告: part缺少axis.origin字段，使用默认值[0,0,0]")
+        elif fixed_mask[i]:
+            print(f"⚠️  警告: parent part {parent_idx[i]} 缺少axis.origin字段，使用默认值[0,0,0]")
         else:
-            # Base link（没有parent）
-            return np.array([0.0, 0.0, 0.0])
+            print(f"⚠️  警告: 未知joint类型 '{jtypes[i]}'，使用默认值[0,0,0]")
     
-    else:
-        print(f"⚠️  警告: 未知joint类型 '{joint_type}'，使用默认值[0,0,0]")
-        return np.array([0.0, 0.0, 0.0])
+    return base_id, mesh_origins
 
 
-def find_base_link_id(diffuse_tree):
+# link名称中需要替换为下划线的字符
+_LINK_NAME_TRANS = str.maketrans(' -.', '___')
+
+
+@functools.lru_cache(maxsize=4096)
+def sanitize_link_name(name):
     """
-    找到base_link的part_id
-    
-    通常是最后一个fixed类型且没有parent的部件
+    清理link名称，移除特殊字符
     
     Args:
-        diffuse_tree (list): diffuse_tree列表
+        name (str): 原始名称
     
     Returns:
-        int: base link的索引
+        str: 清理后的名称
     """
-    for i in range(len(diffuse_tree) - 1, -1, -1):
-        part = diffuse_tree[i]
-        if part['joint']['type'] == 'fixed' and ('parent' not in part or part['parent'] is None):
-            return i
-    return len(diffuse_tree) - 1  # 默认最后一个
+    return name.translate(_LINK_NAME_TRANS)
 
 
-def sanitize_link_name(name):
+def _build_part_to_link(diffuse_tree, base_id):
     """
-    清理link名称，移除特殊字符
+    构建part_id到link_name的映射（生成和验证共用，保证两边一致）
     
     Args:
-        name (str): 原始名称
+        diffuse_tree (list): diffuse_tree列表
+        base_id (int): base link的索引
     
     Returns:
-        str: 清理后的名称
+        list: 第i个元素是part_i对应的link名称
     """
-    return name.replace(' ', '_').replace('-', '_').replace('.', '_')
+    part_to_link = []
+    name_counts = {}  # 追踪名称使用次数，处理重复名称
+    
+    for i, part in enumerate(diffuse_tree):
+        if i == base_id:
+            link_name = "base_link"
+        else:
+            # 使用part name或默认part_i
+            raw_name = part.get('name', f'part_{i}')
+            base_name = sanitize_link_name(raw_name)
+            
+            # 处理重复名称：添加索引后缀
+            if base_name in name_counts:
+                name_counts[base_name] += 1
+                link_name = f"{base_name}_{name_counts[base_name]}"
+            else:
+                name_counts[base_name] = 0
+                link_name = base_name
+        
+        part_to_link.append(link_name)
+    
+    return part_to_link
+
+
+class _URDFWriter:
+    """
+    URDF文本流式写入器
+
+    URDF的结构固定（robot/link/joint及其已知子元素），直接按缩进写出文本，
+    省去Element对象的构建和整棵树的序列化。
+
+    Args:
+        f (file): 以二进制模式打开的输出文件（文本按UTF-8编码后写入）
+        indent (str): 每一级的缩进字符串
+    """
+
+    def __init__(self, f, indent="  "):
+        self._f = f
+        self._indent = indent
+        self._depth = 0
+        self._write('<?xml version="1.0" encoding="utf-8"?>\n')
+
+    def _write(self, text):
+        self._f.write(text.encode('utf-8'))
+
+    def _open_tag(self, tag, attrs):
+        attr_str = "".join(f" {k}={quoteattr(v)}" for k, v in attrs.items())
+        return f"{self._indent * self._depth}<{tag}{attr_str}"
+
+    def start(self, tag, **attrs):
+        """写出开始标签，后续元素缩进一级"""
+        self._write(self._open_tag(tag, attrs) + ">\n")
+        self._depth += 1
+
+    def end(self, tag):
+        """写出结束标签"""
+        self._depth -= 1
+        self._write(f"{self._indent * self._depth}</{tag}>\n")
+
+    def leaf(self, tag, **attrs):
+        """写出没有子元素的自闭合标签"""
+        self._write(self._open_tag(tag, attrs) + " />\n")
+
+    def comment(self, text):
+        """写出XML注释"""
+        self._write(f"{self._indent * self._depth}<!--{text}-->\n")
+
+
+@contextlib.contextmanager
+def _replace_on_success(f, tmp_path, final_path):
+    """
+    写完并关闭临时文件后再用os.replace原子替换到最终路径
+
+    生成中途出错时删除临时文件并重新抛出异常，原有的URDF保持不变，
+    不会留下只有文件头的半成品（批量脚本按mtime判断是否需要重新转换）。
+    """
+    try:
+        with f:
+            yield f
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, final_path)
+
+
+# 按(joint类型, 是否为base)查表得到(质量, 惯性)
+_PHYSICS = {
+    ('fixed', True): ("10.0", "0.1"),      # base比较重
+    ('fixed', False): ("0.1", "0.001"),    # fixed子部件轻
+    ('prismatic', False): ("3.0", "0.03"), # 抽屉中等
+    ('revolute', False): ("2.0", "0.02"),  # 门中等
+}
+_DEFAULT_PHYSICS = ("1.0", "0.01")
+
+
+def _emit_link_geom(w, obj_paths, mesh_origin_str):
+    """
+    为每个OBJ文件写出独立的visual和collision元素
+    
+    Args:
+        w (_URDFWriter): URDF写入器（当前位于<link>内）
+        obj_paths (list): mesh文件路径列表（相对于URDF）
+        mesh_origin_str (str): mesh origin的"x y z"字符串
+    """
+    for obj_path in obj_paths:
+        for geom_tag in ('visual', 'collision'):
+            w.start(geom_tag)
+            w.leaf('origin', xyz=mesh_origin_str, rpy="0 0 0")
+            w.start('geometry')
+            w.leaf('mesh', filename=obj_path)
+            w.end('geometry')
+            w.end(geom_tag)
 
 
 def create_urdf_from_object_json(
@@ -145,8 +291,8 @@ def create_urdf_from_object_json(
         print(f"📖 读取 {object_json_path}...")
     
     try:
-        with open(object_json_path, 'r') as f:
-            obj_data = json.load(f)
+        with open(object_json_path, 'rb') as f:
+            obj_data = _loads(f.read())
     except FileNotFoundError:
         print(f"❌ 错误: 文件不存在 - {object_json_path}")
         return False
@@ -168,214 +314,153 @@ def create_urdf_from_object_json(
         print(f"   模型ID: {model_id}")
         print(f"   部件数: {len(diffuse_tree)}")
     
-    # 2. 找到base_link
-    base_id = find_base_link_id(diffuse_tree)
+    # 2. 找到base_link，同时计算所有部件的mesh origin（核心公式，整体计算一次）
+    base_id, mesh_origins = analyze_diffuse_tree(diffuse_tree)
+    # 转成Python列表，格式化时不再逐个走numpy标量转换
+    mesh_origins = mesh_origins.tolist()
     if verbose:
         print(f"   Base link: part_{base_id}")
     
-    # 3. 创建URDF根元素
-    robot = Element('robot', name=robot_name)
-    robot.append(Comment(f' Auto-generated from {os.path.basename(object_json_path)} '))
-    robot.append(Comment(' Conversion script: convert_object_json_to_urdf.py '))
-    robot.append(Comment(' Formula: mesh_origin = -joint_origin (for main parts) '))
-    robot.append(Comment('          mesh_origin = -parent_joint_origin (for fixed children) '))
+    # 3. 构建part_id到link_name的映射
+    part_to_link = _build_part_to_link(diffuse_tree, base_id)
     
-    # 4. 构建part_id到link_name的映射
-    part_to_link = {}
-    name_counts = {}  # 追踪名称使用次数，处理重复名称
+    # mesh路径的目录前缀只需拼接一次
+    obj_dir_prefix = obj_dir.rstrip('/') + '/'
     
-    for i, part in enumerate(diffuse_tree):
-        if i == base_id:
-            link_name = "base_link"
-        else:
-            # 使用part name或默认part_i
-            raw_name = part.get('name', f'part_{i}')
-            base_name = sanitize_link_name(raw_name)
-            
-            # 处理重复名称：添加索引后缀
-            if base_name in name_counts:
-                name_counts[base_name] += 1
-                link_name = f"{base_name}_{name_counts[base_name]}"
-            else:
-                name_counts[base_name] = 0
-                link_name = base_name
+    # 4. 打开输出文件（URDF结构固定，直接流式写出文本，不再构建DOM）
+    try:
+        # 创建输出目录（如果不存在）
+        output_dir = os.path.dirname(output_urdf_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
         
-        part_to_link[i] = link_name
+        # 先写到临时文件，全部成功后再替换；64KiB缓冲区，整份URDF通常只需很少几次write系统调用
+        tmp_path = output_urdf_path + '.tmp'
+        f = open(tmp_path, 'wb', buffering=65536)
+    except Exception as e:
+        print(f"❌ 错误: 写入文件失败 - {e}")
+        return False
     
-    # 5. 遍历所有parts，创建links和joints
     created_links = set()
     joint_stats = {'revolute': 0, 'prismatic': 0, 'fixed': 0}
     
-    for part_id, part in enumerate(diffuse_tree):
-        link_name = part_to_link[part_id]
-        joint_type = part['joint']['type']
-        joint_stats[joint_type] = joint_stats.get(joint_type, 0) + 1
-        
-        # 计算mesh origin（核心公式）
-        mesh_origin = get_mesh_origin(part, diffuse_tree)
-        mesh_origin_str = f"{mesh_origin[0]:.6f} {mesh_origin[1]:.6f} {mesh_origin[2]:.6f}"
-        
-        # 获取OBJ文件名并创建Link
-        link = SubElement(robot, 'link', name=link_name)
+    with _replace_on_success(f, tmp_path, output_urdf_path):
+        w = _URDFWriter(f)
+        w.start('robot', name=robot_name)
+        w.comment(f' Auto-generated from {os.path.basename(object_json_path)} ')
+        w.comment(' Conversion script: convert_object_json_to_urdf.py ')
+        w.comment(' Formula: mesh_origin = -joint_origin (for main parts) ')
+        w.comment('          mesh_origin = -parent_joint_origin (for fixed children) ')
         
-        # 处理视觉和碰撞几何体
-        if 'objs' in part and len(part['objs']) > 0:
-            for obj_filename in part['objs']:
-                # 如果object.json中的路径已包含目录，直接使用
-                if obj_filename.startswith('objs/'):
-                    obj_path = obj_filename
-                else:
-                    obj_path = f"{obj_dir}/{obj_filename}"
-                
-                # 为每个OBJ文件创建独立的visual和collision元素
-                visual = SubElement(link, 'visual')
-                SubElement(visual, 'origin', xyz=mesh_origin_str, rpy="0 0 0")
-                vis_geom = SubElement(visual, 'geometry')
-                SubElement(vis_geom, 'mesh', filename=obj_path)
-                
-                # Collision
-                collision = SubElement(link, 'collision')
-                SubElement(collision, 'origin', xyz=mesh_origin_str, rpy="0 0 0")
-                col_geom = SubElement(collision, 'geometry')
-                SubElement(col_geom, 'mesh', filename=obj_path)
-        else:
-            obj_filename = f"{model_id}_part_{part_id}.obj"
-            obj_path = f"{obj_dir}/{obj_filename}"
+        # 5. 遍历所有parts，写出links和joints
+        for part_id, part in enumerate(diffuse_tree):
+            link_name = part_to_link[part_id]
+            joint_type = part['joint']['type']
+            joint_stats[joint_type] = joint_stats.get(joint_type, 0) + 1
             
-            # Visual
-            visual = SubElement(link, 'visual')
-            SubElement(visual, 'origin', xyz=mesh_origin_str, rpy="0 0 0")
-            vis_geom = SubElement(visual, 'geometry')
-            SubElement(vis_geom, 'mesh', filename=obj_path)
+            mesh_origin_str = "%.6f %.6f %.6f" % tuple(mesh_origins[part_id])
             
-            # Collision
-            collision = SubElement(link, 'collision')
-            SubElement(collision, 'origin', xyz=mesh_origin_str, rpy="0 0 0")
-            col_geom = SubElement(collision, 'geometry')
-            SubElement(col_geom, 'mesh', filename=obj_path)
-        
-        # Inertial（简化处理）
-        inertial = SubElement(link, 'inertial')
-        SubElement(inertial, 'origin', xyz=mesh_origin_str, rpy="0 0 0")
-        
-        # 根据joint类型设置质量和惯性
-        if joint_type == 'fixed':
-            if part_id == base_id:
-                mass_val = "10.0"  # base比较重
-                inertia_val = "0.1"
-            else:
-                mass_val = "0.1"  # fixed子部件轻
-                inertia_val = "0.001"
-        elif joint_type == 'prismatic':
-            mass_val = "3.0"  # 抽屉中等
-            inertia_val = "0.03"
-        elif joint_type == 'revolute':
-            mass_val = "2.0"  # 门中等
-            inertia_val = "0.02"
-        else:
-            mass_val = "1.0"
-            inertia_val = "0.01"
-        
-        SubElement(inertial, 'mass', value=mass_val)
-        SubElement(inertial, 'inertia',
-                  ixx=inertia_val, ixy="0", ixz="0",
-                  iyy=inertia_val, iyz="0", izz=inertia_val)
-        
-        created_links.add(link_name)
-        
-        # ========== 创建Joint（如果有parent）==========
-        if 'parent' in part and part['parent'] is not None:
-            parent_id = part['parent']
+            # 获取OBJ文件名并创建Link
+            w.start('link', name=link_name)
             
-            # 检查parent是否有效
-            if parent_id < 0 or parent_id >= len(diffuse_tree):
-                print(f"⚠️  警告: part_{part_id}的parent_id {parent_id}无效，跳过joint创建")
-                continue
+            # 处理视觉和碰撞几何体：没有objs时使用默认的<model_id>_part_<i>.obj
+            obj_filenames = part.get('objs') or [f"{model_id}_part_{part_id}.obj"]
+            # 如果object.json中的路径已包含目录，直接使用
+            obj_paths = [name if name.startswith('objs/') else obj_dir_prefix + name
+                         for name in obj_filenames]
+            _emit_link_geom(w, obj_paths, mesh_origin_str)
             
-            parent_link = part_to_link[parent_id]
-            joint_name = f"joint_{link_name}"
+            # Inertial（简化处理）
+            w.start('inertial')
+            w.leaf('origin', xyz=mesh_origin_str, rpy="0 0 0")
             
-            joint = SubElement(robot, 'joint', name=joint_name, type=joint_type)
-            SubElement(joint, 'parent', link=parent_link)
-            SubElement(joint, 'child', link=link_name)
+            # 根据joint类型设置质量和惯性（只有fixed类型区分base）
+            is_base = joint_type == 'fixed' and part_id == base_id
+            mass_val, inertia_val = _PHYSICS.get((joint_type, is_base), _DEFAULT_PHYSICS)
             
-            # Joint origin是parent的mesh origin
-            #parent_part = diffuse_tree[parent_id]
-            parent_part=part
-            # 检查parent是否有axis字段
-            if 'axis' in parent_part['joint'] and 'origin' in parent_part['joint']['axis']:
-                joint_origin = np.array(parent_part['joint']['axis']['origin'])
-                joint_origin_str = f"{joint_origin[0]:.6f} {joint_origin[1]:.6f} {joint_origin[2]:.6f}"
-                SubElement(joint, 'origin', xyz=joint_origin_str, rpy="0 0 0")
-                print(f"joint_{link_name} origin: {joint_origin_str}")
-            else:
-                print(f"⚠️  警告: parent part {parent_id} 缺少axis.origin字段，joint origin使用默认值[0,0,0]")
-                SubElement(joint, 'origin', xyz="0 0 0", rpy="0 0 0")
+            w.leaf('mass', value=mass_val)
+            w.leaf('inertia',
+                   ixx=inertia_val, ixy="0", ixz="0",
+                   iyy=inertia_val, iyz="0", izz=inertia_val)
+            w.end('inertial')
+            w.end('link')
             
-            # Axis和Limits（仅对revolute、prismatic和continuous）
-            if joint_type in ['revolute', 'prismatic', 'continuous']:
-                if 'axis' in part['joint'] and 'direction' in part['joint']['axis']:
-                    axis_dir = part['joint']['axis']['direction']
-                    axis_str = f"{axis_dir[0]} {axis_dir[1]} {axis_dir[2]}"
-                    SubElement(joint, 'axis', xyz=axis_str)
+            created_links.add(link_name)
+            
+            # ========== 创建Joint（如果有parent）==========
+            if 'parent' in part and part['parent'] is not None:
+                parent_id = part['parent']
+                
+                # 检查parent是否有效
+                if parent_id < 0 or parent_id >= len(diffuse_tree):
+                    print(f"⚠️  警告: part_{part_id}的parent_id {parent_id}无效，跳过joint创建")
+                    continue
+                
+                parent_link = part_to_link[parent_id]
+                joint_name = f"joint_{link_name}"
+                
+                w.start('joint', name=joint_name, type=joint_type)
+                w.leaf('parent', link=parent_link)
+                w.leaf('child', link=link_name)
+                
+                # Joint origin是parent的mesh origin
+                #parent_part = diffuse_tree[parent_id]
+                parent_part=part
+                # 检查parent是否有axis字段
+                if 'axis' in parent_part['joint'] and 'origin' in parent_part['joint']['axis']:
+                    joint_origin_str = "%.6f %.6f %.6f" % tuple(parent_part['joint']['axis']['origin'])
+                    w.leaf('origin', xyz=joint_origin_str, rpy="0 0 0")
+                    print(f"joint_{link_name} origin: {joint_origin_str}")
                 else:
-                    print(f"⚠️  警告: part_{part_id} 缺少axis方向，使用默认值[1,0,0]")
-                    SubElement(joint, 'axis', xyz="1 0 0")
+                    print(f"⚠️  警告: parent part {parent_id} 缺少axis.origin字段，joint origin使用默认值[0,0,0]")
+                    w.leaf('origin', xyz="0 0 0", rpy="0 0 0")
                 
-                # Limit
-                if 'range' in part['joint']:
-                    limit_range = part['joint']['range']
-                    effort = "10"  # 默认值
-                    velocity = "1"  # 默认值
+                # Axis和Limits（仅对revolute、prismatic和continuous）
+                if joint_type in ['revolute', 'prismatic', 'continuous']:
+                    if 'axis' in part['joint'] and 'direction' in part['joint']['axis']:
+                        axis_dir = part['joint']['axis']['direction']
+                        axis_str = f"{axis_dir[0]} {axis_dir[1]} {axis_dir[2]}"
+                        w.leaf('axis', xyz=axis_str)
+                    else:
+                        print(f"⚠️  警告: part_{part_id} 缺少axis方向，使用默认值[1,0,0]")
+                        w.leaf('axis', xyz="1 0 0")
                     
-                    if joint_type == 'prismatic':
-                        lower = f"{np.deg2rad(limit_range[0]):.6f}"  # 错误修正：应该是直接使用数值而不是转换
-                        upper = f"{np.deg2rad(limit_range[1]):.6f}"
-                        if upper<lower:
-                            upper,lower=lower,upper
-                        SubElement(joint, 'limit', lower=str(limit_range[0]), upper=str(limit_range[1]), effort=effort, velocity=velocity)
-                        print(f"   ℹ️  {link_name}: 转换range [{limit_range[0]}, {limit_range[1]}] cm → [{limit_range[0]:.6f}, {limit_range[1]:.6f}] m")
-                    elif joint_type in ['revolute', 'continuous']:
-                        lower = f"{np.deg2rad(limit_range[0]):.6f}"
-                        upper = f"{np.deg2rad(limit_range[1]):.6f}"
-                        if upper<lower:
-                            upper,lower=lower,upper
-                        if joint_type == 'revolute':
-                            SubElement(joint, 'limit', lower=lower, upper=upper, effort=effort, velocity=velocity)
-                            print(f"   ℹ️  {link_name}: 转换range [{limit_range[0]}, {limit_range[1]}] 度 → [{lower}, {upper}] 弧度")
-                        else:  # continuous类型不限制范围
-                            SubElement(joint, 'limit', effort=effort, velocity=velocity)
-                else:
-                    # 默认limit
-                    effort = "10"
-                    velocity = "1"
-                    if joint_type == 'prismatic':
-                        SubElement(joint, 'limit', lower="-0.5", upper="0.5", effort=effort, velocity=velocity)
-                    elif joint_type == 'revolute':
-                        SubElement(joint, 'limit', lower="0", upper="3.14159", effort=effort, velocity=velocity)
-                    # continuous类型不限制范围
-    
-    # 6. 美化XML并输出
-    rough_string = tostring(robot, encoding='unicode')
-    reparsed = minidom.parseString(rough_string)
-    pretty_xml = reparsed.toprettyxml(indent="  ")
-    
-    # 移除多余空行
-    lines = [line for line in pretty_xml.split('\n') if line.strip()]
-    final_xml = '\n'.join(lines)
-    
-    # 7. 写入文件
-    try:
-        # 创建输出目录（如果不存在）
-        output_dir = os.path.dirname(output_urdf_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+                    # Limit
+                    if 'range' in part['joint']:
+                        limit_range = part['joint']['range']
+                        effort = "10"  # 默认值
+                        velocity = "1"  # 默认值
+                        
+                        if joint_type == 'prismatic':
+                            lower = f"{math.radians(limit_range[0]):.6f}"  # 错误修正：应该是直接使用数值而不是转换
+                            upper = f"{math.radians(limit_range[1]):.6f}"
+                            if upper<lower:
+                                upper,lower=lower,upper
+                            w.leaf('limit', lower=str(limit_range[0]), upper=str(limit_range[1]), effort=effort, velocity=velocity)
+                            print(f"   ℹ️  {link_name}: 转换range [{limit_range[0]}, {limit_range[1]}] cm → [{limit_range[0]:.6f}, {limit_range[1]:.6f}] m")
+                        elif joint_type in ['revolute', 'continuous']:
+                            lower = f"{math.radians(limit_range[0]):.6f}"
+                            upper = f"{math.radians(limit_range[1]):.6f}"
+                            if upper<lower:
+                                upper,lower=lower,upper
+                            if joint_type == 'revolute':
+                                w.leaf('limit', lower=lower, upper=upper, effort=effort, velocity=velocity)
+                                print(f"   ℹ️  {link_name}: 转换range [{limit_range[0]}, {limit_range[1]}] 度 → [{lower}, {upper}] 弧度")
+                            else:  # continuous类型不限制范围
+                                w.leaf('limit', effort=effort, velocity=velocity)
+                    else:
+                        # 默认limit
+                        effort = "10"
+                        velocity = "1"
+                        if joint_type == 'prismatic':
+                            w.leaf('limit', lower="-0.5", upper="0.5", effort=effort, velocity=velocity)
+                        elif joint_type == 'revolute':
+                            w.leaf('limit', lower="0", upper="3.14159", effort=effort, velocity=velocity)
+                        # continuous类型不限制范围
+                
+                w.end('joint')
         
-        with open(output_urdf_path, 'w') as f:
-            f.write(final_xml)
-    except Exception as e:
-        print(f"❌ 错误: 写入文件失败 - {e}")
-        return False
+        w.end('robot')
     
     if verbose:
         print(f"\n✅ URDF生成成功！")
@@ -408,78 +493,55 @@ def validate_urdf_against_json(urdf_path, json_path, verbose=True):
     
     try:
         # 读取数据
-        with open(json_path, 'r') as f:
-            obj_data = json.load(f)
+        with open(json_path, 'rb') as f:
+            obj_data = _loads(f.read())
         
-        tree = ET.parse(urdf_path)
-        root = tree.getroot()
+        # 提取URDF中的mesh origins：流式解析，每个link处理完就释放，不保留整棵树
+        urdf_origins = {}
+        for _, elem in ET.iterparse(urdf_path, events=('end',)):
+            if elem.tag == 'link':
+                visual = elem.find('visual/origin')
+                if visual is not None:
+                    urdf_origins[elem.get('name')] = [float(x) for x in visual.get('xyz').split()]
+                elem.clear()
     except Exception as e:
         print(f"❌ 错误: 读取文件失败 - {e}")
         return False
     
     diffuse_tree = obj_data['diffuse_tree']
-    base_id = find_base_link_id(diffuse_tree)
+    # base_link和期望的mesh origins（与生成时使用同一遍计算）
+    base_id, expected = analyze_diffuse_tree(diffuse_tree)
     
     # 构建part_to_link映射（与生成时一致）
-    part_to_link = {}
-    name_counts = {}
-    
-    for i, part in enumerate(diffuse_tree):
-        if i == base_id:
-            link_name = 'base_link'
-        else:
-            raw_name = part.get('name', f'part_{i}')
-            base_name = sanitize_link_name(raw_name)
-            
-            # 处理重复名称
-            if base_name in name_counts:
-                name_counts[base_name] += 1
-                link_name = f"{base_name}_{name_counts[base_name]}"
+    part_to_link = _build_part_to_link(diffuse_tree, base_id)
+    
+    # 把实际值按part顺序堆叠成(N, 3)数组，URDF中缺失的link记为NaN
+    n = len(diffuse_tree)
+    actual = np.full((n, 3), np.nan)
+    found = np.zeros(n, dtype=bool)
+    for i, link_name in enumerate(part_to_link):
+        xyz = urdf_origins.get(link_name)
+        if xyz is not None:
+            actual[i] = xyz
+            found[i] = True
+    
+    # 一次性比较所有part，允许2cm误差（考虑可能的手动微调）；NaN比较结果为False
+    diff_ok = np.all(np.abs(expected - actual) <= 0.02, axis=1)
+    bad_ids = np.flatnonzero(~diff_ok)
+    all_match = len(bad_ids) == 0
+    mismatch_count = len(bad_ids)
+    
+    # 只对不匹配的part输出详细信息
+    if verbose:
+        for i in bad_ids:
+            link_name = part_to_link[i]
+            if found[i]:
+                print(f"   ❌ {link_name}:")
+                print(f"      期望: {expected[i]}")
+                print(f"      实际: {actual[i]}")
+                print(f"      差异: {actual[i] - expected[i]}")
             else:
-                name_counts[base_name] = 0
-                link_name = base_name
-        
-        part_to_link[i] = link_name
-    
-    # 提取URDF中的mesh origins
-    urdf_origins = {}
-    for link in root.findall('link'):
-        link_name = link.get('name')
-        visual = link.find('visual/origin')
-        if visual is not None:
-            xyz = [float(x) for x in visual.get('xyz').split()]
-            urdf_origins[link_name] = np.array(xyz)
-    
-    # 验证每个part
-    all_match = True
-    mismatch_count = 0
-    
-    for i, part in enumerate(diffuse_tree):
-        # 确定link_name（需要和生成时一致） - 使用已经构建好的映射
-        link_name = part_to_link[i]
-        
-        # 计算期望值
-        expected = get_mesh_origin(part, diffuse_tree)
-        
-        # 比较
-        if link_name in urdf_origins:
-            actual = urdf_origins[link_name]
-            # 允许2cm误差（考虑可能的手动微调）
-            match = np.allclose(expected, actual, atol=0.02)
-            
-            if not match:
-                all_match = False
-                mismatch_count += 1
-                if verbose:
-                    print(f"   ❌ {link_name}:")
-                    print(f"      期望: {expected}")
-                    print(f"      实际: {actual}")
-                    print(f"      差异: {actual - expected}")
-        else:
-            if verbose:
                 print(f"   ⚠️  未找到link: {link_name}")
-            all_match = False
-            mismatch_count += 1
     
     if verbose:
         if all_match:
@@ -490,6 +552,78 @@ def validate_urdf_against_json(urdf_path, json_path, verbose=True):
     return all_match
 
 
+def _convert_one(json_path, output_suffix, validate):
+    """
+    批量模式下在子进程中转换（并可选验证）单个object.json
+    
+    转换/验证过程中打印的内容先收集起来随结果返回，由主进程在对应文件的标题下
+    整块输出，避免多个进程的输出互相穿插。
+    
+    Args:
+        json_path (str): object.json文件路径
+        output_suffix (str): 输出文件后缀
+        validate (bool): 是否验证生成的URDF
+    
+    Returns:
+        tuple: (json_path, 输出路径, 是否生成成功, 是否验证通过, 打印的日志文本)
+    """
+    # 确定输出路径
+    json_dir = os.path.dirname(json_path)
+    output_path = os.path.join(json_dir, f"model{output_suffix}")
+    
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        # 转换
+        success = create_urdf_from_object_json(
+            json_path, 
+            output_path, 
+            obj_dir="objs",
+            verbose=False
+        )
+        
+        valid = False
+        if success and validate:
+            valid = validate_urdf_against_json(output_path, json_path, verbose=False)
+    
+    return json_path, output_path, success, valid, buf.getvalue()
+
+
+def _find_object_jsons(directory, recursive=True):
+    """
+    用os.scandir搜索目录下的object.json文件（生成器，边遍历边返回）
+    
+    与原先的glob("**/object.json")一致，跳过以'.'开头的隐藏目录；
+    不跟随目录符号链接，避免链接成环时无限遍历。
+    
+    Args:
+        directory (str): 搜索目录
+        recursive (bool): 是否递归搜索子目录
+    
+    Yields:
+        str: object.json文件路径
+    """
+    if not recursive:
+        json_path = os.path.join(directory, "object.json")
+        if os.path.isfile(json_path):
+            yield json_path
+        return
+    
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith('.'):
+                            stack.append(entry.path)
+                    elif entry.name == "object.json" and entry.is_file():
+                        yield entry.path
+        except OSError:
+            # 无权限等无法读取的目录直接跳过（与glob行为一致）
+            continue
+
+
 def batch_convert(directory, output_suffix=".urdf", validate=False, recursive=True):
     """
     批量转换目录下的所有object.json文件
@@ -509,54 +643,48 @@ def batch_convert(directory, output_suffix=".urdf", validate=False, recursive=Tr
     print(f"   验证URDF: {'是' if validate else '否'}")
     print()
     
-    # 搜索所有object.json文件
-    pattern = os.path.join(directory, "**", "object.json") if recursive else os.path.join(directory, "object.json")
-    json_files = glob.glob(pattern, recursive=recursive)
-    
-    if not json_files:
-        print(f"❌ 未找到object.json文件")
-        return 0, 0
-    
-    print(f"📁 找到 {len(json_files)} 个object.json文件\n")
-    
     success_count = 0
     fail_count = 0
     
-    for i, json_path in enumerate(json_files, 1):
-        print(f"[{i}/{len(json_files)}] 处理 {json_path}")
+    # 各文件的转换互相独立、输出路径不重叠，且主要是Python字节码计算，用进程池并行
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # 边搜索object.json边提交，找到第一个文件就开始转换
+        futures = [
+            executor.submit(_convert_one, json_path, output_suffix, validate)
+            for json_path in _find_object_jsons(directory, recursive)
+        ]
+        total = len(futures)
         
-        # 确定输出路径
-        json_dir = os.path.dirname(json_path)
-        output_path = os.path.join(json_dir, f"model{output_suffix}")
+        if not futures:
+            print(f"❌ 未找到object.json文件")
+            return 0, 0
         
-        # 转换
-        success = create_urdf_from_object_json(
-            json_path, 
-            output_path, 
-            obj_dir="objs",
-            verbose=False
-        )
+        print(f"📁 找到 {total} 个object.json文件\n")
         
-        if success:
-            print(f"   ✅ 生成成功: {output_path}")
-            success_count += 1
+        for i, future in enumerate(as_completed(futures), 1):
+            json_path, output_path, success, valid, log = future.result()
+            print(f"[{i}/{total}] 处理 {json_path}")
+            print(log, end="")
             
-            # 验证（如果需要）
-            if validate:
-                valid = validate_urdf_against_json(output_path, json_path, verbose=False)
-                if valid:
-                    print(f"   ✅ 验证通过")
-                else:
-                    print(f"   ⚠️  验证失败")
-        else:
-            print(f"   ❌ 生成失败")
-            fail_count += 1
-        
-        print()
+            if success:
+                print(f"   ✅ 生成成功: {output_path}")
+                success_count += 1
+                
+                # 验证（如果需要）
+                if validate:
+                    if valid:
+                        print(f"   ✅ 验证通过")
+                    else:
+                        print(f"   ⚠️  验证失败")
+            else:
+                print(f"   ❌ 生成失败")
+                fail_count += 1
+            
+            print()
     
     print(f"\n📊 批量转换完成:")
-    print(f"   成功: {success_count}/{len(json_files)}")
-    print(f"   失败: {fail_count}/{len(json_files)}")
+    print(f"   成功: {success_count}/{total}")
+    print(f"   失败: {fail_count}/{total}")
     
     return success_count, fail_count
 
@@ -16,28 +16,48 @@ update_mjcf_file_paths_auto.py
 import sys
 import os
 import re
-
-def update_mjcf_file_paths_auto(xml_file_path: str, output_file_path: str | None = None):
-    # 读取原始文件
-    with open(xml_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # 找到第一个包含 '/objs/' 的 file=".../objs/..." 路径并提取前缀
-    m = re.search(r'file="([^"]*/objs/)([^"]+)"', content)
-    if not m:
-        print("未在文件中找到任何包含 '/objs/' 的 mesh 路径。无需替换。")
-        return content
-
-    detected_prefix = m.group(1)  # e.g. /home/blackbird/GYH/.../objs/
-    print(f"检测到的 objs 前缀: '{detected_prefix}'")
-
-    # 构造针对该前缀的替换正则：只替换以检测到的前缀开头的路径
-    # 使用 re.escape 确保前缀里的特殊字符被正确转义
-    pref_escaped = re.escape(detected_prefix)
-    pattern = rf'file="{pref_escaped}([^"]+)"'
-
-    # 替换为相对路径 file="objs/<name>"
-    new_content, nsub = re.subn(pattern, r'file="objs/\1"', content)
+import mmap
+
+# file=".../objs/NAME" 形式的mesh路径，模块加载时编译一次（字节模式，可直接在mmap上匹配）
+_OBJS_PATH_RE = re.compile(rb'file="([^"]*/objs/)([^"]+)"')
+
+def _update_mjcf_file_paths_bytes(xml_file_path: str, output_file_path: str | None = None) -> bytes:
+    """替换 mesh 路径前缀并写出文件，返回替换后的文件内容（bytes，不额外解码一份str）"""
+    # 内存映射读取原始文件，直接在字节缓冲区上查找/替换，不整体解码成str
+    with open(xml_file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # 空文件无法mmap，也不可能包含路径
+            print("未在文件中找到任何包含 '/objs/' 的 mesh 路径。无需替换。")
+            return b''
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # 找到第一个包含 '/objs/' 的 file=".../objs/..." 路径并提取前缀
+            m = _OBJS_PATH_RE.search(mm)
+            if not m:
+                print("未在文件中找到任何包含 '/objs/' 的 mesh 路径。无需替换。")
+                return mm[:]
+
+            detected_prefix = m.group(1)  # e.g. /home/blackbird/GYH/.../objs/
+            print(f"检测到的 objs 前缀: '{detected_prefix.decode('utf-8')}'")
+
+            # 前缀本身是普通字符串，直接按字面值查找并替换为相对路径 file="objs/<name>"，
+            # 不需要正则和match对象
+            needle = b'file="' + detected_prefix
+            if mm.find(needle + b'"') == -1:
+                pieces = []
+                pos = 0
+                while (hit := mm.find(needle, pos)) != -1:
+                    pieces.append(mm[pos:hit])
+                    pieces.append(b'file="objs/')
+                    pos = hit + len(needle)
+                pieces.append(mm[pos:])
+                nsub = len(pieces) // 2
+                new_content = b''.join(pieces)
+            else:
+                # 存在 file="<前缀>" 这种空文件名时，回退到正则，只替换后面带文件名的路径
+                # 使用 re.escape 确保前缀里的特殊字符被正确转义
+                pattern = rb'file="' + re.escape(detected_prefix) + rb'([^"]+)"'
+                new_content, nsub = re.subn(pattern, rb'file="objs/\1"', mm)
     print(f"已替换 {nsub} 处匹配到的路径（基于检测到的前缀）。")
 
     # 如果某些路径使用不同的前缀（例如多个不同根），可额外再做一次更广泛的替换（可选）
@@ -48,12 +68,17 @@ def update_mjcf_file_paths_auto(xml_file_path: str, output_file_path: str | None
     if output_file_path is None or output_file_path.strip() == "":
         output_file_path = xml_file_path
 
-    with open(output_file_path, 'w', encoding='utf-8') as f:
+    # 上面的mmap已关闭，覆盖原文件也是安全的
+    with open(output_file_path, 'wb') as f:
         f.write(new_content)
 
     print(f"已写入：{output_file_path}")
     return new_content
 
+def update_mjcf_file_paths_auto(xml_file_path: str, output_file_path: str | None = None) -> str:
+    """替换 mesh 路径前缀并写出文件，返回替换后的文件内容（str，需要字符串的调用方使用）"""
+    return _update_mjcf_file_paths_bytes(xml_file_path, output_file_path).decode('utf-8')
+
 if __name__ == '__main__':
     if len(sys.argv) < 2:
         print("用法: python update_mjcf_file_paths_auto.py input.xml [output.xml]")
@@ -66,4 +91,5 @@ if __name__ == '__main__':
         print(f"输入文件不存在: {input_file}")
         sys.exit(1)
 
-    update_mjcf_file_paths_auto(input_file, output_file)
+    # 命令行不需要返回值，直接用字节版本，省去解码整份文件
+    _update_mjcf_file_paths_bytes(input_file, output_file)
@@ -35,12 +35,29 @@ fix_obj_geom_recursive.py (modified)
 """
 
 import argparse
+import contextlib
+import functools
+import io
+import mmap
 import os
+import re
+import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import List, Tuple
 
 import numpy as np
 
+# 扰动用的随机数生成器（PCG64），比 np.random.rand 走的全局 RandomState 更快；
+# 进程池中每个工作进程会在 _init_worker 里用系统熵重新播种，避免 fork 出的进程生成相同序列
+_RNG = np.random.default_rng()
+
+
+def _init_worker():
+    global _RNG
+    _RNG = np.random.default_rng()
+
 
 # ======================= CLI 参数 =======================
 
@@ -50,10 +67,11 @@ def parse_args():
         description="递归修复 OBJ 语法，并处理顶点过少/几何退化的问题。"
     )
     p.add_argument(
-        "root",
-        nargs="?",
-        default=".",
-        help="扫描的根目录（默认当前目录）",
+        "roots",
+        nargs="*",
+        default=["."],
+        metavar="root",
+        help="扫描的根目录，可一次传入多个（默认当前目录）",
     )
 
     # 相对退化阈值：某轴范围 < rel_tol * max_range 视为退化
@@ -94,13 +112,25 @@ def parse_args():
         help="只打印将要做的修改，不真正写回文件。",
     )
 
+    p.add_argument(
+        "--force",
+        action="store_true",
+        help="忽略 .fixed 标记，重新处理所有 OBJ。",
+    )
+
     return p.parse_args()
 
 
 # ======================= 文本级语法修复 =======================
 
 
-def sanitize_obj_lines(raw_lines: List[str]) -> List[str]:
+# 行首空白 + 'v '：去掉空白，顶点行统一顶格
+_LEADING_WS_V = re.compile(rb"^[ \t\f\v]+(?=v )", re.M)
+# 非 v 开头的行中第一处 'v '（连同其前面的空白），拆到下一行
+_STRAY_V = re.compile(rb"^(?!v )([^\n]*?)[ \t\f\v]*v ", re.M)
+
+
+def sanitize_obj_data(data) -> List[str]:
     """
     修复类似：
         f 3/1/2 2/2/2 1/3/2v -0.1552 ...
@@ -112,31 +142,20 @@ def sanitize_obj_lines(raw_lines: List[str]) -> List[str]:
     - 行首不是 v 开头；
     - 行中间出现 'v '；
     -> 按第一处 'v ' 切成两行。
-    """
-    out: List[str] = []
-    for line in raw_lines:
-        s = line.rstrip("\n\r")
-        stripped = s.lstrip()
 
-        if stripped.startswith("v "):
-            out.append(stripped + "\n")
-            continue
-
-        idx = s.find("v ")
-        if idx > 0 and not stripped.startswith("v "):
-            left = s[:idx].rstrip()
-            right = s[idx:].lstrip()
-            if left:
-                out.append(left + "\n")
-            if right:
-                out.append(right + "\n")
-        else:
-            if s == "":
-                out.append("\n")
-            else:
-                out.append(s + "\n")
+    整个文件作为一个 bytes（或 mmap）处理，用预编译正则一次完成替换，
+    不再逐行在 Python 里 lstrip/find。
+    """
+    # 统一换行符为 \n（与文本模式读取一致）；没有 \r 时直接在 mmap 上做正则替换，免去一次整文件拷贝
+    if data.find(b"\r") != -1:
+        data = bytes(data).replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    data = _LEADING_WS_V.sub(b"", data)
+    data = _STRAY_V.sub(rb"\1\nv ", data)
+    if data and not data.endswith(b"\n"):
+        data += b"\n"
 
-    return out
+    # StringIO 只按 \n 分行（str.splitlines 还会按 \f 等字符分行）
+    return io.StringIO(data.decode("utf-8", errors="ignore")).readlines()
 
 
 # ======================= 解析顶点 & 面 =======================
@@ -150,33 +169,63 @@ def load_obj_vertices_faces(path: str):
     - 顶点所在行号索引 v_line_indices
     - 面的数量 face_count
     """
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        raw_lines = f.readlines()
+    # 内存映射读取，正则直接在映射的缓冲区上运行（空文件无法 mmap）
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            lines = sanitize_obj_data(b"")
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                lines = sanitize_obj_data(mm)
 
-    lines = sanitize_obj_lines(raw_lines)
+    # 行分类直接用 map(str.startswith) 在 C 层逐行判断，不经过 Python 层的循环体
+    v_mask = np.fromiter(
+        map(str.startswith, lines, repeat("v ")), dtype=bool, count=len(lines)
+    )
+    v_line_indices = np.flatnonzero(v_mask).tolist()
+    face_count = sum(map(str.startswith, lines, repeat("f ")))
 
+    if not v_line_indices:
+        raise ValueError(f"在 {path} 中没有找到任何 v x y z 顶点行。")
+
+    # 所有 v 行拼成一个缓冲区，一次交给 numpy 的 C 解析器
+    try:
+        verts = np.loadtxt(
+            io.StringIO("".join([lines[i] for i in v_line_indices])),
+            usecols=(1, 2, 3),
+            dtype=np.float64,
+            comments=None,
+            ndmin=2,
+        )
+    except ValueError:
+        # 存在坐标不足 3 个或无法解析的 v 行：回退到逐行解析，跳过这些行
+        verts, v_line_indices = parse_vertex_lines(lines, v_line_indices)
+        if not v_line_indices:
+            raise ValueError(f"在 {path} 中没有找到任何 v x y z 顶点行。")
+
+    return lines, verts, v_line_indices, face_count
+
+
+def parse_vertex_lines(lines: List[str], candidates: List[int]):
+    """
+    逐行解析 v 行（load_obj_vertices_faces 的回退路径），
+    跳过坐标不足 3 个或无法转成浮点数的行。
+
+    返回 (verts, v_line_indices)。
+    """
     verts = []
     v_line_indices = []
-    face_count = 0
-
-    for i, line in enumerate(lines):
-        if line.startswith("v "):
-            parts = line.strip().split()
-            if len(parts) < 4:
-                continue
-            try:
-                x, y, z = map(float, parts[1:4])
-            except ValueError:
-                continue
-            verts.append((x, y, z))
-            v_line_indices.append(i)
-        elif line.startswith("f "):
-            face_count += 1
-
-    if not verts:
-        raise ValueError(f"在 {path} 中没有找到任何 v x y z 顶点行。")
+    for i in candidates:
+        parts = lines[i].strip().split()
+        if len(parts) < 4:
+            continue
+        try:
+            x, y, z = map(float, parts[1:4])
+        except ValueError:
+            continue
+        verts.append((x, y, z))
+        v_line_indices.append(i)
 
-    return lines, np.array(verts, dtype=np.float64), v_line_indices, face_count
+    return np.array(verts, dtype=np.float64).reshape(-1, 3), v_line_indices
 
 
 # ======================= 退化轴检测 & 厚度拉伸 =======================
@@ -188,16 +237,25 @@ def detect_degenerate_axes(verts: np.ndarray, rel_tol: float, abs_tol: float):
     ranges = maxs - mins
     max_range = ranges.max()
 
-    deg_mask = np.zeros(3, dtype=bool)
-    for i in range(3):
-        if ranges[i] < abs_tol:
-            deg_mask[i] = True
-        elif max_range > 0 and ranges[i] < rel_tol * max_range:
-            deg_mask[i] = True
+    # 绝对阈值或相对阈值任一满足即视为退化
+    deg_mask = (ranges < abs_tol) | ((max_range > 0) & (ranges < rel_tol * max_range))
 
     return ranges, deg_mask
 
 
+def is_flat(verts: np.ndarray, ranges: np.ndarray, rel_tol: float, abs_tol: float) -> bool:
+    """
+    判断顶点是否（近似）共面/共线：沿方差最小的方向（协方差矩阵最小特征值对应的
+    特征向量）测厚度，阈值与 detect_degenerate_axes 相同。
+    倾斜放置的平面网格各坐标轴范围都不小，只有这样才能查出来。
+    """
+    centered = verts - verts.mean(axis=0)
+    _, eigvecs = np.linalg.eigh(centered.T @ centered)
+    proj = centered @ eigvecs[:, 0]
+    thickness = proj.max() - proj.min()
+    return bool(thickness < abs_tol or thickness < rel_tol * ranges.max())
+
+
 def inflate_degenerate_axes(
     verts: np.ndarray,
     deg_mask: np.ndarray,
@@ -214,62 +272,61 @@ def inflate_degenerate_axes(
     maxs = new_verts.max(axis=0)
     ranges = maxs - mins
     N = new_verts.shape[0]
-    idx = np.arange(N)
 
-    for ax in range(3):
-        if not deg_mask[ax]:
-            continue
+    # 各轴中心：有范围时取包围盒中点，否则取均值
+    centers = np.where(ranges > 0, 0.5 * (mins + maxs), new_verts.mean(axis=0))
 
-        if ranges[ax] > 0:
-            center = 0.5 * (mins[ax] + maxs[ax])
-        else:
-            center = new_verts[:, ax].mean()
+    if N == 1:
+        t = np.array([-0.5])
+    else:
+        t = (np.arange(N) / (N - 1)) - 0.5  # [-0.5, 0.5]
 
-        if N == 1:
-            new_verts[0, ax] = center - 0.5 * min_span_abs
-        else:
-            t = (idx / (N - 1)) - 0.5  # [-0.5, 0.5]
-            new_verts[:, ax] = center + t * min_span_abs
+    # 所有退化轴一次广播赋值
+    new_verts[:, deg_mask] = centers[deg_mask][None, :] + t[:, None] * min_span_abs
 
     return new_verts
 
 
+def count_unique_rows(verts: np.ndarray, limit: int) -> int:
+    """
+    用哈希集合统计唯一顶点数，数到 limit 个即提前返回
+    （正常网格前几个顶点就互不相同，不必对整个数组排序去重）。
+    """
+    seen = set()
+    # + 0.0 把 -0.0 归一成 0.0，与 np.unique 的比较语义一致
+    for row in verts + 0.0:
+        seen.add(row.tobytes())
+        if len(seen) >= limit:
+            break
+    return len(seen)
+
+
 # ======================= 四面体构造（处理唯一顶点数 < 4） =======================
 
 
+# 补点用的小偏移（单位轴 * 0.001）
+_BASE_OFFSETS = 0.001 * np.eye(3)
+
+
 def ensure_three_base_points(uniq_verts: np.ndarray) -> np.ndarray:
     """
     确保有 3 个用于构造四面体的“底面点”：
     - 若已有 3 个：直接返回
-    - 若为 2 个：构造第三个点为中点 + 垂直偏移
-    - 若为 1 个：构造两个偏移点
+    - 若为 2 个：第三个点为中点沿 p2-p1 分量最小的坐标轴做小偏移（该轴必不与 p2-p1 平行）
+    - 若为 1 个：沿 X、Y 轴各偏移出一个点
     """
     n = uniq_verts.shape[0]
     if n >= 3:
         return uniq_verts[:3]
 
     if n == 2:
-        p1 = uniq_verts[0]
-        p2 = uniq_verts[1]
-        mid = 0.5 * (p1 + p2)
-        # 构造一个与 p2-p1 垂直的小偏移
-        v = p2 - p1
-        # 找一个非平行向量
-        if abs(v[0]) < abs(v[1]):
-            ref = np.array([1.0, 0.0, 0.0])
-        else:
-            ref = np.array([0.0, 1.0, 0.0])
-        nvec = np.cross(v, ref)
-        nlen = np.linalg.norm(nvec) or 1.0
-        nvec /= nlen
-        third = mid + 0.001 * nvec  # 很小偏移
+        p1, p2 = uniq_verts
+        axis = np.argmin(np.abs(p2 - p1))
+        third = 0.5 * (p1 + p2) + _BASE_OFFSETS[axis]
         return np.vstack([p1, p2, third])
 
     # n == 1
-    p = uniq_verts[0]
-    p1 = p + np.array([0.001, 0.0, 0.0])
-    p2 = p + np.array([0.0, 0.001, 0.0])
-    return np.vstack([p, p1, p2])
+    return uniq_verts[0] + np.vstack([np.zeros(3), _BASE_OFFSETS[:2]])
 
 
 def make_tetra_from_points(
@@ -328,28 +385,59 @@ def make_tetra_from_points(
 # ======================= 写回 OBJ（只改顶点坐标） =======================
 
 
-def write_obj_inplace_simple(path: str, new_lines: List[str]):
+def format_vertex_lines(verts: np.ndarray) -> List[str]:
     """
-    直接用 new_lines 覆盖写回 OBJ（适用于四面体这种完全重写的情况）。
-    修改：如果已经存在 path + '.bak'，则**不**用当前 path 去覆盖/替换该 .bak，
-    而是直接写回 path（并保留已有的 .bak）。
+    把 (N, 3) 顶点数组格式化为 "v x y z\n" 行（8 位小数）。
+
+    用一个重复 N 次的格式串做一次 % 运算，整块格式化在 C 层完成，
+    而不是对每个顶点调用一次 f-string。
+    """
+    n = verts.shape[0]
+    block = ("v %.8f %.8f %.8f\n" * n) % tuple(verts.ravel().tolist())
+    return block.splitlines(keepends=True)
+
+
+def _backup_and_write(path: str, text: str):
+    """
+    首次写入前把原 obj 备份为 path + '.bak'（已有 bak 则保留不动），再写回 text。
+
+    备份优先用硬链接（不复制数据），失败再退回重命名、复制。
+    由于硬链接与原文件共享数据，新内容先写到 path + '.tmp'，再用 os.replace
+    原子替换 path，不会截断 bak；中途失败时原 obj 也保持完整。
     """
     backup = path + ".bak"
 
-    # 如果没有备份，则把原始 obj 作为备份；若备份已存在，则保留它不动
     if not os.path.exists(backup) and os.path.exists(path):
         try:
-            os.rename(path, backup)
-        except Exception:
-            # 若重命名失败（权限或其它），尝试用复制的方式保留备份
-            import shutil
+            os.link(path, backup)
+        except (OSError, NotImplementedError):
+            # 文件系统不支持硬链接（或权限问题）：重命名，再不行就复制
+            try:
+                os.rename(path, backup)
+            except OSError:
+                shutil.copy2(path, backup)
+
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        # 新文件沿用原 obj 的权限（重命名备份后原 obj 已不在，改从 bak 取）
+        shutil.copymode(path if os.path.exists(path) else backup, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        # 成功时 tmp 已被替换掉；失败时清理残留的 tmp
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
-            shutil.copy2(path, backup)
 
-    # 写回新的 obj 文件
-    with open(path, "w", encoding="utf-8") as f:
-        for line in new_lines:
-            f.write(line)
+def write_obj_inplace_simple(path: str, new_lines: List[str]):
+    """
+    直接用 new_lines 覆盖写回 OBJ（适用于四面体这种完全重写的情况）。
+    修改：如果已经存在 path + '.bak'，则**不**用当前 path 去覆盖/替换该 .bak，
+    而是直接写回 path（并保留已有的 .bak）。
+    """
+    # 拼成一个字符串，一次写入
+    _backup_and_write(path, "".join(new_lines))
 
 
 def write_obj_inplace_with_verts(
@@ -363,57 +451,34 @@ def write_obj_inplace_with_verts(
 
     修改：如果 path+'.bak' 已存在，则不覆盖该 bak 文件；否则在首次写入时创建 bak。
     """
-    backup_path = path + ".bak"
-    # 只有在没有备份且目标文件存在的情况下，才把原 obj 重命名为 bak
-    if not os.path.exists(backup_path) and os.path.exists(path):
-        try:
-            os.rename(path, backup_path)
-        except Exception:
-            import shutil
-
-            shutil.copy2(path, backup_path)
+    # 先生成新的 v 行，按行号替换到副本中，再一次写入
+    new_v_strs = format_vertex_lines(verts_new)
+    out_lines = list(lines)
+    for line_idx, v_str in zip(v_line_indices, new_v_strs):
+        out_lines[line_idx] = v_str
 
-    verts_iter = iter(verts_new)
-    v_line_set = set(v_line_indices)
+    _backup_and_write(path, "".join(out_lines))
 
-    with open(path, "w", encoding="utf-8") as f:
-        for i, line in enumerate(lines):
-            if i in v_line_set and line.startswith("v "):
-                x, y, z = next(verts_iter)
-                f.write(f"v {x:.8f} {y:.8f} {z:.8f}\n")
-            else:
-                f.write(line)
 
+# ======================= 处理标记 =======================
 
-# ======================= 单文件处理 =======================
 
-def save_obj_with_perturbed_vertices(path: str, lines: list, verts: np.ndarray, v_line_indices: list):
-    """
-    将扰动后的 verts 写回 OBJ 文件对应的顶点行。
+def is_already_fixed(path: str) -> bool:
+    """.fixed 标记存在且不早于 .obj 时，认为该文件已处理过。"""
+    try:
+        return os.path.getmtime(path + ".fixed") >= os.path.getmtime(path)
+    except OSError:
+        return False
 
-    Args:
-        path: 原 OBJ 文件路径
-        lines: 原始且修复后的 OBJ 文本行
-        verts: 扰动后的顶点数组 (N, 3)
-        v_line_indices: 对应 verts 的行号 index，用来替换 OBJ 中顶点部分
-    """
 
-    if len(verts) != len(v_line_indices):
-        raise ValueError("verts 与 v_line_indices 数量不匹配，写回失败！")
+def mark_fixed(path: str):
+    """写入（或刷新）空的 .fixed 标记文件。"""
+    with open(path + ".fixed", "wb"):
+        pass
 
-    # 更新对应行
-    for vert, line_idx in zip(verts, v_line_indices):
-        x, y, z = vert
-        # 按原格式写回，保留高精度
-        lines[line_idx] = f"v {x:.8f} {y:.8f} {z:.8f}\n"
 
-    # 写回文件，覆盖保存
-    #new_path = path.replace(".obj", "_perturbed.obj")
-    with open(path, "w", encoding="utf-8") as f:
-        f.writelines(lines)
+# ======================= 单文件处理 =======================
 
-    print(f"✔ 已写入扰动后的 OBJ 文件：{path}")
-    return path
 
 def process_obj_file(
     path: str,
@@ -422,11 +487,18 @@ def process_obj_file(
     min_span_abs: float,
     tetra_thickness: float,
     dry_run: bool,
+    force: bool = False,
 ) -> bool:
     """
     新增逻辑：如果存在 path + '.bak'，则以该 bak 文件作为**源**来加载和处理，
     但写回仍然写到 path（.obj），并保持 .bak 不被覆盖/删除。
+
+    处理完成后会留下一个空的 path + '.fixed' 标记；再次运行时若标记不早于 .obj
+    （即 .obj 之后没有被改过），直接跳过，除非 force=True。
     """
+    if not force and is_already_fixed(path):
+        return False
+
     bak_path = path + ".bak"
     source_path = path
     source_was_bak = False
@@ -442,31 +514,36 @@ def process_obj_file(
         print(f"[SKIP] {path}: {e}")
         return False
     #print(f"origin_verts:{verts}")
-    epsilon = 1e-4
-    randomized_verts = verts + (np.random.rand(*verts.shape) - 0.5) * 2 * epsilon#强行加上扰动值
-    
-    save_obj_with_perturbed_vertices(path, lines, randomized_verts, v_idx)#把值最终写入path中，保持source_path不变动
-    try:
-        lines, verts, v_idx, face_count = load_obj_vertices_faces(path)#加载path中的信息
-    except ValueError as e:
-        print(f"[SKIP] {path}: {e}")
+    # 先在未扰动的顶点上检测：既无退化轴又不共面的网格本身就是好的，不需要写回
+    ranges, deg_mask = detect_degenerate_axes(verts, rel_tol, abs_tol)
+    if not deg_mask.any() and not is_flat(verts, ranges, rel_tol, abs_tol):
+        print(f"\n[FILE] {path} (source: {'bak' if source_was_bak else 'obj'})")
+        print(f"  顶点数: {verts.shape[0]}, 面数: {face_count}")
+        print(f"  范围 X: {ranges[0]:.6g}, Y: {ranges[1]:.6g}, Z: {ranges[2]:.6g}")
+        print("  原始顶点无退化轴且不共面，不做任何修改。")
+        if not dry_run:
+            mark_fixed(path)
         return False
+
+    epsilon = 1e-4
+    # 强行加上扰动值；直接在内存中继续处理，最后只写回一次（不再先写盘再重新读一遍）
+    verts = verts + (_RNG.random(verts.shape) - 0.5) * 2 * epsilon
     ranges, deg_mask = detect_degenerate_axes(verts, rel_tol, abs_tol)
     #print(f"randomized:{verts}")
-    mins = verts.min(axis=0)
-    maxs = verts.max(axis=0)    
     print(f"\n[FILE] {path} (source: {'bak' if source_was_bak else 'obj'})")
     print(f"  顶点数: {verts.shape[0]}, 面数: {face_count}")
     print(f"  范围 X: {ranges[0]:.6g}, Y: {ranges[1]:.6g}, Z: {ranges[2]:.6g}")
 
-    # 先看唯一顶点数
-    uniq_verts = np.unique(np.round(verts, decimals=12), axis=0)
-    n_uniq = uniq_verts.shape[0]
-    print(f"  唯一顶点数: {n_uniq}")
+    # 先看唯一顶点数（只需知道是否 >= 4，数到 4 个就停）
+    rounded = np.round(verts, decimals=12)
+    n_uniq = count_unique_rows(rounded, limit=4)
+    print(f"  唯一顶点数: {n_uniq if n_uniq < 4 else '>= 4'}")
 
     # ---------- 情况1：唯一顶点数 < 4 -> 必须造四面体，避免 "at least 4 vertices required" ----------
     if n_uniq < 4:
         print("  唯一顶点数 < 4，直接重写为小四面体，保证有体积且顶点数 >= 4。")
+        # 很少走到这里，此时才真正求出唯一顶点集合
+        uniq_verts = np.unique(rounded, axis=0)
         base3 = ensure_three_base_points(uniq_verts)
 
         # 找一个 mtllib 行保留下来（如果有）
@@ -488,6 +565,7 @@ def process_obj_file(
 
         # 写回到 path（.obj），并确保原有 bak 不被覆盖
         write_obj_inplace_simple(path, tetra_lines)
+        mark_fixed(path)
         print(f"  已重写为四面体（写回 {path}，原始 bak 保留为 {bak_path} 如果存在）。")
         return True
 
@@ -503,53 +581,117 @@ def process_obj_file(
             return True
 
         write_obj_inplace_with_verts(path, lines, verts_new, v_idx)
+        mark_fixed(path)
         print(f"  已写回文件（写回 {path}，原始 bak 保留为 {bak_path} 如果存在）。")
         return True
 
-    # ---------- 情况3：顶点数够，且无退化轴 -> 不用动 ----------
-    print("  顶点数 >= 4 且未发现明显退化轴，不做任何修改。")
+    # ---------- 情况3：顶点数够，且扰动后无退化轴 -> 写回扰动后的顶点 ----------
+    # 原始网格是扁平的（否则上面已经跳过），正是扰动给了它厚度，必须写回
+    print("  原始顶点共面/共线，扰动后已无退化轴，写回扰动后的顶点。")
 
-    return False
+    if dry_run:
+        print("  [DRY-RUN] 仅预览扰动写回，不写回。")
+        return True
+
+    write_obj_inplace_with_verts(path, lines, verts, v_idx)
+    mark_fixed(path)
+    print(f"✔ 已写入扰动后的 OBJ 文件：{path}")
+    return True
 
 
 # ======================= 主逻辑 =======================
 
 
+def process_obj_file_logged(path: str, **kwargs) -> Tuple[bool, str]:
+    """
+    在工作进程中调用 process_obj_file，并把它打印的内容收集起来一起返回，
+    由主进程按文件顺序连同 "=== [i/N] ===" 标题一起输出，避免多进程输出互相穿插。
+    """
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        changed = process_obj_file(path, **kwargs)
+    return changed, buf.getvalue()
+
+
+def iter_obj_files(root: str):
+    """
+    用 os.scandir 递归查找 root 下的 .obj 文件（生成器）。
+
+    与 os.walk 行为一致：不进入目录符号链接，无法读取的目录直接跳过；
+    scandir 的目录项自带类型信息，不必再逐个 stat。
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            stack.append(entry.path)
+                    elif entry.name.lower().endswith(".obj"):
+                        yield entry.path
+        except OSError:
+            continue
+
+
 def main():
     args = parse_args()
 
-    root = os.path.abspath(args.root)
-    if not os.path.exists(root):
-        print(f"路径不存在: {root}")
-        sys.exit(1)
+    roots = [os.path.abspath(r) for r in args.roots]
+    for root in roots:
+        if not os.path.exists(root):
+            print(f"路径不存在: {root}")
+            sys.exit(1)
+
+    worker = functools.partial(
+        process_obj_file_logged,
+        rel_tol=args.rel_tol,
+        abs_tol=args.abs_tol,
+        min_span_abs=args.min_span_abs,
+        tetra_thickness=args.tetra_thickness,
+        dry_run=args.dry_run,
+        force=args.force,
+    )
 
-    print(f"扫描根目录: {root}")
+    # 一次调用处理多个目录，摊薄解释器启动与 numpy 导入的开销
     obj_files: List[str] = []
-    for dirpath, dirnames, filenames in os.walk(root):
-        for fn in filenames:
-            if fn.lower().endswith(".obj"):
-                obj_files.append(os.path.join(dirpath, fn))
-
-    if not obj_files:
-        print("没有找到任何 .obj 文件。")
-        return
-
-    print(f"共找到 {len(obj_files)} 个 OBJ。")
-    if args.dry_run:
-        print("DRY RUN 模式：不会写回文件。\n")
 
+    def scan_roots():
+        # 根目录可能重叠或重复，同一个 OBJ 只提交一次（按真实路径去重），
+        # 否则多个进程会同时读写同一个 obj/.tmp/.bak
+        seen = set()
+        for root in roots:
+            print(f"扫描根目录: {root}")
+            for path in iter_obj_files(root):
+                real = os.path.realpath(path)
+                if real in seen:
+                    continue
+                seen.add(real)
+                obj_files.append(path)
+                yield path
+
+    # 每个 OBJ 的处理互相独立且是 CPU 密集型（解析 + NumPy），用进程池并行；
+    # 扫描结果边产生边提交，扫描未结束时工作进程就已开始处理
     modified = 0
-    for i, path in enumerate(sorted(obj_files)):
-        print(f"\n=== [{i + 1}/{len(obj_files)}] {path} ===")
-        if process_obj_file(
-            path=path,
-            rel_tol=args.rel_tol,
-            abs_tol=args.abs_tol,
-            min_span_abs=args.min_span_abs,
-            tetra_thickness=args.tetra_thickness,
-            dry_run=args.dry_run,
-        ):
-            modified += 1
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker) as ex:
+        # map 会先把可迭代对象全部提交完才返回，此时 obj_files 已收集完整
+        results = ex.map(worker, scan_roots(), chunksize=32)
+
+        if not obj_files:
+            print("没有找到任何 .obj 文件。")
+            return
+
+        print(f"共找到 {len(obj_files)} 个 OBJ。")
+        if args.dry_run:
+            print("DRY RUN 模式：不会写回文件。\n")
+
+        # 按文件顺序逐个打印标题和该文件的处理日志
+        for i, (path, (changed, log)) in enumerate(zip(obj_files, results)):
+            print(f"\n=== [{i + 1}/{len(obj_files)}] {path} ===")
+            print(log, end="")
+            if changed:
+                modified += 1
 
     print("\n========== 统计 ==========")
     print(f"总 OBJ 数: {len(obj_files)}")